@@ -3,25 +3,35 @@
 """ ML2P core utilities.
 """
 
-import datetime
+import concurrent.futures
+import copy
 import enum
+import functools
 import importlib
 import json
 import os
 import pathlib
 import shutil
 import tarfile
-import urllib.parse
-import uuid
+import threading
+import time
+import traceback
 import warnings
 
-import boto3
 import yaml
 
 from . import __version__ as ml2p_version
 from . import hyperparameters
 from .errors import LocalEnvError
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+# whether SageMakerEnv.dataset_folder(...) has already issued its deprecation warning
+_dataset_folder_warned = False
+
 
 class ModellingProject:
     """ Object for holding CLI context. """
@@ -76,11 +86,22 @@ class ModellingSubCfg:
 
 
 class S3URL:
-    """ A friendly interface to an S3 URL. """
+    """ A friendly interface to an S3 URL.
+
+        :param str s3folder:
+            An S3 URL of the form s3://bucket/path.
+    """
+
+    __slots__ = ("_s3root", "_bucket", "_path_prefix", "_url_prefix")
 
     def __init__(self, s3folder):
-        self._s3url = urllib.parse.urlparse(s3folder)
-        self._s3root = self._s3url.path.strip("/")
+        if not s3folder.startswith("s3://"):
+            raise ValueError(f"S3 URL {s3folder!r} should start with 's3://'.")
+        bucket, _, root = s3folder[5:].partition("/")  # 5 == len("s3://")
+        self._s3root = root.strip("/")
+        self._bucket = bucket
+        self._path_prefix = self._s3root + "/" if self._s3root else ""
+        self._url_prefix = f"s3://{self._bucket}/{self._path_prefix}"
 
     def bucket(self):
         """ Return the bucket of the S3 URL.
@@ -89,7 +110,7 @@ class S3URL:
             :returns:
                 The bucket of the S3 URL.
         """
-        return self._s3url.netloc
+        return self._bucket
 
     def path(self, suffix):
         """ Return the base path of the S3 URL followed by a '/' and the
@@ -102,8 +123,7 @@ class S3URL:
             :returns:
                 The path with the suffix appended.
         """
-        path = self._s3root + "/" + suffix.lstrip("/")
-        return path.lstrip("/")  # handles empty s3root
+        return self._path_prefix + suffix.lstrip("/")
 
     def url(self, suffix=""):
         """ Return S3 URL followed by a '/' and the given suffix.
@@ -115,7 +135,7 @@ class S3URL:
             :returns:
                 The URL with the suffix appended.
         """
-        return "s3://{}/{}".format(self._s3url.netloc, self.path(suffix))
+        return self._url_prefix + suffix.lstrip("/")
 
 
 class SageMakerEnvType(enum.Enum):
@@ -169,8 +189,27 @@ class SageMakerEnv:
     SERVE = SageMakerEnvType.SERVE
     LOCAL = SageMakerEnvType.LOCAL
 
+    __slots__ = (
+        "_ml_folder",
+        "_data_folder",
+        "_training_folder",
+        "_model_folder",
+        "_hyperparameters",
+        "_resourceconfig",
+        "_settings",
+        "env_type",
+        "training_job_name",
+        "model_version",
+        "record_invokes",
+    )
+
     def __init__(self, ml_folder, environ=None):
         self._ml_folder = pathlib.Path(ml_folder)
+        self._data_folder = self._ml_folder / "input" / "data"
+        self._training_folder = self._data_folder / "training"
+        self._model_folder = self._ml_folder / "model"
+        self._hyperparameters = None
+        self._resourceconfig = None
         if environ is None:
             if "TRAINING_JOB_NAME" in os.environ:
                 # this is a training job instance
@@ -182,19 +221,63 @@ class SageMakerEnv:
         self.training_job_name = environ["training_job_name"]
         self.model_version = environ["model_version"]
         self.record_invokes = environ["record_invokes"]
-        self.project = environ["project"]
-        self.model_cls = environ["model_cls"]
-        self.s3 = None
-        if environ["s3_url"]:
-            self.s3 = S3URL(environ["s3_url"])
+        self._settings = None
+        if "project" in environ:
+            self._settings = self._ml2p_settings(environ)
+
+    @property
+    def project(self):
+        """ The ML2P project name. """
+        return self._lazy_settings()["project"]
+
+    @project.setter
+    def project(self, value):
+        self._lazy_settings()["project"] = value
+
+    @property
+    def model_cls(self):
+        """ The full dotted Python name of the ml2p.core.Model class. """
+        return self._lazy_settings()["model_cls"]
+
+    @model_cls.setter
+    def model_cls(self, value):
+        self._lazy_settings()["model_cls"] = value
+
+    @property
+    def s3(self):
+        """ The URL of the project S3 bucket. """
+        return self._lazy_settings()["s3"]
+
+    @s3.setter
+    def s3(self, value):
+        self._lazy_settings()["s3"] = value
+
+    def _ml2p_settings(self, environ):
+        return {
+            "project": environ["project"],
+            "model_cls": environ["model_cls"],
+            "s3": S3URL(environ["s3_url"]) if environ["s3_url"] else None,
+        }
+
+    def _lazy_settings(self):
+        # training environments read these settings from the hyperparameters only
+        # when they are first needed, to avoid reading the file at start up
+        if self._settings is None:
+            self._settings = self._ml2p_settings(self._train_settings_environ())
+        return self._settings
 
     def _train_environ(self):
-        environ = self.hyperparameters().get("ML2P_ENV", {})
+        # the ML2P project settings are loaded later by ._lazy_settings()
         return {
             "env_type": self.TRAIN,
             "training_job_name": os.environ.get("TRAINING_JOB_NAME", None),
             "model_version": None,
             "record_invokes": None,
+        }
+
+    def _train_settings_environ(self):
+        environ = self.hyperparameters().get("ML2P_ENV", {})
+        return {
             "project": environ.get("ML2P_PROJECT", None),
             "model_cls": environ.get("ML2P_MODEL_CLS", None),
             "s3_url": environ.get("ML2P_S3_URL", None),
@@ -213,23 +296,37 @@ class SageMakerEnv:
         }
 
     def hyperparameters(self):
+        # the hyperparameters do not change during a job, so they are only read once,
+        # but a copy is returned so that callers cannot modify the cached value
+        if self._hyperparameters is None:
+            self._hyperparameters = self._read_hyperparameters()
+        return copy.deepcopy(self._hyperparameters)
+
+    def _read_hyperparameters(self):
         hp_path = self._ml_folder / "input" / "config" / "hyperparameters.json"
         if not hp_path.exists():
             return {}
-        with hp_path.open() as f:
-            return hyperparameters.decode(json.load(f))
+        return hyperparameters.decode(_json_loads(hp_path.read_bytes()))
 
     def resourceconfig(self):
+        # the resource config does not change during a job, so it is only read once,
+        # but a copy is returned so that callers cannot modify the cached value
+        if self._resourceconfig is None:
+            self._resourceconfig = self._read_resourceconfig()
+        return copy.deepcopy(self._resourceconfig)
+
+    def _read_resourceconfig(self):
         rc_path = self._ml_folder / "input" / "config" / "resourceconfig.json"
         if not rc_path.exists():
             return {}
-        with rc_path.open() as f:
-            return json.load(f)
+        return _json_loads(rc_path.read_bytes())
 
     def dataset_folder(self, dataset=None):
+        global _dataset_folder_warned
         if dataset is None:
-            dataset = "training"
-        else:
+            return self._training_folder
+        if not _dataset_folder_warned:
+            _dataset_folder_warned = True
             warnings.warn(
                 "Passing a dataset name to dataset_folder method(...) is deprecated."
                 " If you wish to access the ML2P training dataset, do not pass any"
@@ -238,13 +335,13 @@ class SageMakerEnv:
                 " used by AWS SageMaker more accurately.",
                 DeprecationWarning,
             )
-        return self._ml_folder / "input" / "data" / dataset
+        return self._data_folder / dataset
 
     def data_channel_folder(self, channel):
-        return self._ml_folder / "input" / "data" / channel
+        return self._data_folder / channel
 
     def model_folder(self):
-        return self._ml_folder / "model"
+        return self._model_folder
 
     def write_failure(self, text):
         with open(self._ml_folder / "output" / "failure", "w") as f:
@@ -360,17 +457,176 @@ class LocalEnv(SageMakerEnv):
         tf.extractall(self.model_folder())
 
 
+def _json_dumps_bytes(obj):
+    """ Encode an object as UTF-8 JSON, using orjson if it is available.
+
+        :param obj:
+            The JSON-encodable object to encode.
+        :rtype: bytes
+        :returns:
+            The encoded JSON.
+
+        NumPy scalars and arrays are encoded by orjson directly. Objects that
+        orjson cannot encode but the json module can (e.g. other float sub-classes,
+        or integers larger than 64 bits) are encoded using the json module. Note
+        that orjson encodes NaN and infinity as null, whereas the json module
+        writes NaN and Infinity.
+    """
+    if orjson is not None:
+        try:
+            # OPT_NON_STR_KEYS matches the json module's handling of non-string keys
+            # and OPT_SERIALIZE_NUMPY avoids the fallback for NumPy results
+            return orjson.dumps(
+                obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+            )
+        except orjson.JSONEncodeError:
+            pass
+    return json.dumps(obj).encode("utf-8")
+
+
+def _json_loads(data):
+    """ Decode UTF-8 JSON, using orjson if it is available.
+
+        :param bytes data:
+            The JSON to decode.
+        :returns:
+            The decoded object.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+_S3_CLIENT = None
+
+
+def _get_s3_client():
+    """ Return the S3 client shared by all predictors, creating it if necessary.
+
+        Sharing a single client allows predictors to re-use pooled connections
+        when recording invocations instead of performing a new TLS handshake
+        for each client.
+    """
+    global _S3_CLIENT
+    if _S3_CLIENT is None:
+        # boto3 is imported here rather than at module level because importing it
+        # is slow and only predictors need it
+        import boto3
+        import botocore.config
+
+        config = botocore.config.Config(
+            max_pool_connections=50,
+            tcp_keepalive=True,
+            retries={"max_attempts": 3, "mode": "standard"},
+        )
+        _S3_CLIENT = boto3.client("s3", config=config)
+    return _S3_CLIENT
+
+
+@functools.lru_cache(maxsize=None)
 def import_string(name):
     """ Import a class given its absolute name.
 
         :param str name:
             The name of the model, e.g. mypackage.submodule.ModelTrainerClass.
+
+        Results are cached, so repeated calls with the same name are cheap. Call
+        import_string.cache_clear() to discard the cache.
     """
     modname, _, classname = name.rpartition(".")
     mod = importlib.import_module(modname)
     return getattr(mod, classname)
 
 
+def _random_hex():
+    """ Return 128 random bits formatted as 32 hexadecimal digits. """
+    return os.urandom(16).hex()
+
+
+def _utc_isoformat():
+    """ Return the current UTC time as an ISO8601 string with microseconds.
+
+        No UTC offset is included because a "+" in an S3 key is decoded as a space
+        by many consumers (e.g. S3 event notifications).
+    """
+    secs, usecs = divmod(int(time.time() * 1000000), 1000000)
+    return "{}.{:06d}".format(
+        time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(secs)), usecs
+    )
+
+
+class _RecordBuffer:
+    """ Collects encoded invocation records so that they can be stored together.
+
+        :param int max_records:
+            The number of records to collect before writing them.
+        :param float max_seconds:
+            The number of seconds after the first record is collected at which
+            the collected records are written, even if no further records arrive.
+        :param write:
+            A function that stores a list of encoded records.
+    """
+
+    def __init__(self, max_records, max_seconds, write):
+        self._max_records = max_records
+        self._max_seconds = max_seconds
+        self._write = write
+        self._lock = threading.Lock()
+        # held while writing so that .flush() waits for writes already in progress
+        self._write_lock = threading.Lock()
+        self._records = []
+        self._timer = None
+
+    def add(self, record):
+        """ Add an encoded record, writing the collected records if necessary. """
+        with self._lock:
+            self._records.append(record)
+            if len(self._records) < self._max_records:
+                if self._timer is None:
+                    self._start_timer()
+                return
+            records = self._take_records()
+        with self._write_lock:
+            self._write(records)
+
+    def flush(self):
+        """ Write any collected records and wait for any writes already in progress
+            to finish.
+        """
+        with self._lock:
+            records = self._take_records()
+        with self._write_lock:
+            if records:
+                self._write(records)
+
+    def _take_records(self):
+        """ Remove and return the collected records. Call with the lock held. """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        records, self._records = self._records, []
+        return records
+
+    def _start_timer(self):
+        """ Start a timer that writes the collected records. Call with the lock held.
+        """
+        # a daemon thread so that an idle buffer does not keep the process alive
+        self._timer = threading.Timer(self._max_seconds, self._flush_on_timer)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _flush_on_timer(self):
+        try:
+            self.flush()
+        except Exception:
+            # there is no caller to raise the exception to, so report it instead
+            traceback.print_exc()
+
+
+def _noop(*args, **kw):
+    """ Do nothing. Used in place of methods that have been disabled. """
+
+
 class ModelTrainer:
     """ An interface that allows ml2p-docker to train models within SageMaker.
     """
@@ -395,11 +651,118 @@ class ModelTrainer:
 class ModelPredictor:
     """ An interface that allows ml2p-docker to make predictions from a model within
         SageMaker.
+
+        Whether invocations are recorded in S3 is decided from
+        env.record_invokes when the predictor is created. Changing
+        env.record_invokes afterwards (e.g. in .setup()) has no effect.
+
+        Sub-classes may set:
+
+        * BATCH_WORKERS to the number of threads the default .batch_result(...)
+          implementation uses to call .result(...) concurrently (default: 1, i.e.
+          results are calculated one after another).
+
+        * RECORD_WORKERS to the maximum number of threads used to store the records
+          of a batch invocation in S3 concurrently (default: 1, i.e. records are
+          stored one after another).
+
+        * RECORD_BACKGROUND_WORKERS to the number of background threads used to
+          store invocation records in S3 (default: 0). If this is greater than
+          zero, .invoke(...) and .batch_invoke(...) return without waiting for
+          their records to be stored.
+
+        * RECORD_BACKGROUND_MAX_PENDING to the maximum number of records that may
+          be waiting to be stored by the background threads (default: 1000). Once
+          this many records are pending, invocations wait for space.
+
+        * RECORD_BUFFER_SIZE to the number of invocation records to store together
+          in a single newline-delimited JSON object in S3 (default: 1, i.e. each
+          record is stored in its own object by .record_invoke(...)). Each line
+          of a buffered object holds the record's id, input and result.
+
+        * RECORD_BUFFER_SECONDS to the age in seconds of the oldest buffered record
+          after which the buffer is written by a timer, even if no further
+          records arrive (default: 60). Buffered records are also written by
+          .teardown().
     """
 
+    BATCH_WORKERS = 1
+    RECORD_WORKERS = 1
+    RECORD_BACKGROUND_WORKERS = 0
+    RECORD_BACKGROUND_MAX_PENDING = 1000
+    RECORD_BUFFER_SIZE = 1
+    RECORD_BUFFER_SECONDS = 60
+
+    __slots__ = (
+        "env",
+        "s3_client",
+        "_metadata_base",
+        "_predictions_location",
+        "_record_invoke",
+        "_batch_record_invoke",
+        "_record_store",
+        "_record_pool",
+        "_record_pending",
+        "_record_buffer",
+        "_batch_result_pool",
+        "_batch_record_pool",
+    )
+
     def __init__(self, env):
         self.env = env
-        self.s3_client = boto3.client("s3")
+        self.s3_client = _get_s3_client()
+        self._metadata_base = {
+            "model_version": env.model_version,
+            "ml2p_version": ml2p_version,
+        }
+        self._predictions_location = None
+        # the executors only start their threads once work is submitted
+        self._batch_result_pool = None
+        if self.BATCH_WORKERS > 1:
+            self._batch_result_pool = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.BATCH_WORKERS, thread_name_prefix="ml2p-batch-result"
+            )
+        self._batch_record_pool = None
+        if self.RECORD_WORKERS > 1:
+            self._batch_record_pool = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.RECORD_WORKERS, thread_name_prefix="ml2p-batch-record"
+            )
+        self._init_recording()
+
+    def _init_recording(self):
+        """ Choose how invocations are recorded, so that this is decided once
+            rather than on every invoke.
+        """
+        self._record_store = self._record_pool = self._record_pending = None
+        self._record_buffer = None
+        if not self.env.record_invokes:
+            self._record_invoke = self._batch_record_invoke = _noop
+            return
+        if self.RECORD_BUFFER_SIZE > 1:
+            self._record_buffer = _RecordBuffer(
+                self.RECORD_BUFFER_SIZE,
+                self.RECORD_BUFFER_SECONDS,
+                self._write_record_buffer,
+            )
+            self._record_store = self._buffer_record_invoke
+            batch_store = self._buffer_batch_record_invoke
+        else:
+            self._record_store = self.record_invoke
+            batch_store = self.batch_record_invoke
+        if self.RECORD_BACKGROUND_WORKERS > 0:
+            # the executor only starts its threads once records are submitted
+            self._record_pool = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.RECORD_BACKGROUND_WORKERS,
+                thread_name_prefix="ml2p-record",
+            )
+            self._record_pending = threading.BoundedSemaphore(
+                self.RECORD_BACKGROUND_MAX_PENDING
+            )
+            self._record_invoke = self._submit_record_invoke
+            self._batch_record_invoke = self._submit_batch_record_invoke
+        else:
+            self._record_invoke = self._record_store
+            self._batch_record_invoke = batch_store
 
     def setup(self):
         """ Called once before any calls to .predict(...) are made.
@@ -417,8 +780,19 @@ class ModelPredictor:
             This method should:
 
             * Cleanup any resources acquired in .setup().
+
+            Sub-classes that override this method should call super().teardown()
+            so that any invocation records still being stored in the background
+            or held in the record buffer are written before the predictor exits.
         """
-        pass
+        if self._batch_result_pool is not None:
+            self._batch_result_pool.shutdown(wait=True)
+        if self._batch_record_pool is not None:
+            self._batch_record_pool.shutdown(wait=True)
+        if self._record_pool is not None:
+            self._record_pool.shutdown(wait=True)
+        if self._record_buffer is not None:
+            self._record_buffer.flush()
 
     def invoke(self, data):
         """ Invokes the model and returns the full result.
@@ -435,8 +809,7 @@ class ModelPredictor:
               * result: The result of calling .result(data).
         """
         prediction = {"metadata": self.metadata(), "result": self.result(data)}
-        if self.env.record_invokes:
-            self.record_invoke(data, prediction)
+        self._record_invoke(data, prediction)
         return prediction
 
     def metadata(self):
@@ -451,11 +824,7 @@ class ModelPredictor:
               * model_version: The ML2P_MODEL_VERSION (str).
               * timestamp: The UTC POSIX timestamp in seconds (float).
         """
-        return {
-            "model_version": self.env.model_version,
-            "ml2p_version": ml2p_version,
-            "timestamp": datetime.datetime.utcnow().timestamp(),
-        }
+        return {**self._metadata_base, "timestamp": time.time()}
 
     def result(self, data):
         """ Make a prediction given the input data.
@@ -486,9 +855,7 @@ class ModelPredictor:
         metadata = self.metadata()
         results = self.batch_result(data)
         predictions = [{"metadata": metadata, "result": result} for result in results]
-        if self.env.record_invokes:
-            for datum, prediction in zip(data, predictions):
-                self.record_invoke(datum, prediction)
+        self._batch_record_invoke(data, predictions)
         return {"predictions": predictions}
 
     def batch_result(self, data):
@@ -501,8 +868,23 @@ class ModelPredictor:
                 The list of predictions made for instance of the input data.
 
             This method can be overrided for sub-classes in order to improve
-            performance of batch predictions.
+            performance of batch predictions, e.g. by passing the whole batch
+            to the model at once.
+
+            If BATCH_WORKERS is greater than one, .result(...) is called
+            concurrently from the predictor's pool of that many threads. This is
+            useful when .result(...) spends most of its time waiting on I/O. If the
+            pool is no longer accepting work (e.g. after .teardown()) the results
+            are calculated one after another.
         """
+        if len(data) > 1 and self._batch_result_pool is not None:
+            try:
+                # .map(...) submits all of the data before returning
+                results = self._batch_result_pool.map(self.result, data)
+            except RuntimeError:
+                pass
+            else:
+                return list(results)
         return [self.result(datum) for datum in data]
 
     def record_invoke_id(self, datum, prediction):
@@ -520,8 +902,10 @@ class ModelPredictor:
 
             By default this method returns a dictionary containing the following:
 
-                * "ts": an ISO8601 formatted UTC timestamp.
-                * "uuid": a UUID4 unique identifier.
+                * "ts": an ISO8601 formatted UTC timestamp with microseconds and
+                  no UTC offset.
+                * "uuid": a random 128-bit unique identifier formatted as 32
+                  hexadecimal digits.
 
             Sub-classes may override this method to return their own identifiers,
             but including these default identifiers is recommended.
@@ -529,7 +913,7 @@ class ModelPredictor:
             The name of the record in S3 is determined by combining the key value pairs
             with a dash ("-") and then separating each pair with a double dash ("--").
         """
-        return {"ts": datetime.datetime.utcnow().isoformat(), "uuid": str(uuid.uuid4())}
+        return {"ts": _utc_isoformat(), "uuid": _random_hex()}
 
     def record_invoke(self, datum, prediction):
         """ Store an invocation of the endpoint in the ML2P project S3 bucket.
@@ -541,18 +925,107 @@ class ModelPredictor:
                 The prediction returned for datum by this predictor.
         """
         invoke_id = self.record_invoke_id(datum, prediction)
-        record_filename = (
-            "--".join(["{}-{}".format(k, v) for k, v in invoke_id.items()]) + ".json"
-        )
+        record_filename = "--".join(f"{k}-{v}" for k, v in invoke_id.items()) + ".json"
         record = {"input": datum, "result": prediction}
-        record_bytes = json.dumps(record).encode("utf-8")
-        s3_key = self.env.s3.path(
-            "/predictions/{}/{}".format(self.env.model_version, record_filename)
+        record_bytes = _json_dumps_bytes(record)
+        bucket, prefix = self._records_location()
+        self.s3_client.put_object(
+            Bucket=bucket, Key=prefix + record_filename, Body=record_bytes
         )
+
+    def _records_location(self):
+        """ Return the S3 bucket and key prefix that invocation records are
+            stored under.
+        """
+        # computed on first use because env.s3 may be None if records are not stored
+        if self._predictions_location is None:
+            self._predictions_location = (
+                self.env.s3.bucket(),
+                self.env.s3.path(f"/predictions/{self.env.model_version}/"),
+            )
+        return self._predictions_location
+
+    def batch_record_invoke(self, data, predictions):
+        """ Store a batch of invocations of the endpoint in the ML2P project S3 bucket.
+
+            :param list data:
+                The list of input values passed when invoking the endpoint.
+
+            :param list predictions:
+                The list of predictions returned for data by this predictor.
+
+            Each invocation is stored separately by calling .record_invoke(...).
+            If RECORD_WORKERS is greater than one, the records are written
+            concurrently using the predictor's pool of that many threads. Either
+            way, this method returns once all of them have been stored.
+
+            If the pool is no longer accepting work (e.g. after .teardown() or
+            during interpreter shutdown) the records are stored one after another.
+        """
+        if len(data) > 1 and self._batch_record_pool is not None:
+            try:
+                # .map(...) submits all of the records before returning
+                results = self._batch_record_pool.map(
+                    self.record_invoke, data, predictions
+                )
+            except RuntimeError:
+                pass
+            else:
+                # list(...) consumes the results so that any exceptions are re-raised
+                list(results)
+                return
+        for datum, prediction in zip(data, predictions):
+            self.record_invoke(datum, prediction)
+
+    def _submit_record_invoke(self, datum, prediction):
+        """ Store an invocation record using the background threads.
+
+            If the background threads are no longer accepting work (e.g. after
+            .teardown() or during interpreter shutdown) the record is stored
+            directly instead.
+        """
+        self._record_pending.acquire()
+        try:
+            future = self._record_pool.submit(self._record_store, datum, prediction)
+        except RuntimeError:
+            self._record_pending.release()
+            self._record_store(datum, prediction)
+            return
+        future.add_done_callback(self._record_invoke_done)
+
+    def _submit_batch_record_invoke(self, data, predictions):
+        """ Store a batch of invocation records using the background threads. """
+        for datum, prediction in zip(data, predictions):
+            self._submit_record_invoke(datum, prediction)
+
+    def _buffer_record_invoke(self, datum, prediction):
+        """ Add an invocation record to the record buffer. """
+        invoke_id = self.record_invoke_id(datum, prediction)
+        record = {"id": invoke_id, "input": datum, "result": prediction}
+        self._record_buffer.add(_json_dumps_bytes(record))
+
+    def _buffer_batch_record_invoke(self, data, predictions):
+        """ Add a batch of invocation records to the record buffer. """
+        for datum, prediction in zip(data, predictions):
+            self._buffer_record_invoke(datum, prediction)
+
+    def _write_record_buffer(self, records):
+        """ Store buffered invocation records as a single newline-delimited JSON
+            object in the ML2P project S3 bucket.
+        """
+        bucket, prefix = self._records_location()
+        filename = f"batch--ts-{_utc_isoformat()}--uuid-{_random_hex()}.ndjson"
         self.s3_client.put_object(
-            Bucket=self.env.s3.bucket(), Key=s3_key, Body=record_bytes
+            Bucket=bucket, Key=prefix + filename, Body=b"\n".join(records) + b"\n"
         )
 
+    def _record_invoke_done(self, future):
+        self._record_pending.release()
+        exc = future.exception()
+        if exc is not None:
+            # there is no caller to raise the exception to, so report it instead
+            traceback.print_exception(type(exc), exc, exc.__traceback__)
+
 
 class Model:
     """ A holder for a trainer and predictor.
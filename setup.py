@@ -15,6 +15,7 @@ setup(
     include_package_data=True,
     install_requires=["boto3", "click", "Flask", "Flask-API", "PyYAML"],
     extras_require={
+        "orjson": ["orjson"],
         "dev": [
             "black==19.10b0",
             "bumpversion",
@@ -26,7 +27,8 @@ setup(
             "radon[flake8]",
             "tox",
             "moto",
-        ]
+            "orjson",
+        ],
     },
     entry_points={
         "console_scripts": ["ml2p=ml2p.cli:ml2p", "ml2p-docker=ml2p.docker:ml2p_docker"]
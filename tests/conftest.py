@@ -4,9 +4,10 @@
 
 from .fixtures import (  # noqa: imported so that pytest can find the fixtures
     data_fixtures,
-    fake_utcnow,
-    fake_uuid4,
+    fake_random_hex,
+    fake_time,
     moto_sagemaker,
     moto_session,
+    non_utc_timezone,
     sagemaker,
 )
@@ -3,17 +3,17 @@
 """ Pytest fixtures for tests. """
 
 import contextlib
-import datetime
 import json
 import os
 import pathlib
-import uuid
+import time
 
 import boto3
 import moto
 import pytest
 import yaml
 
+import ml2p.core
 from ml2p import hyperparameters
 from ml2p.core import LocalEnv, SageMakerEnv
 
@@ -23,29 +23,38 @@ MOTO_TEST_REGION = "us-east-1"
 
 
 @pytest.fixture
-def fake_utcnow(monkeypatch):
-    utcnow = datetime.datetime(2019, 1, 31, 12, 0, 2, tzinfo=datetime.timezone.utc)
+def fake_time(monkeypatch):
+    timestamp = 1548936002.0
 
-    class fake_datetime(datetime.datetime):
-        @classmethod
-        def utcnow(cls):
-            return utcnow
+    def fake_time():
+        return timestamp
 
-    monkeypatch.setattr(datetime, "datetime", fake_datetime)
-    return utcnow
+    monkeypatch.setattr(time, "time", fake_time)
+    return timestamp
 
 
 @pytest.fixture
-def fake_uuid4(monkeypatch):
-    uuid4_constant = uuid.UUID(
-        bytes=b" \xf8\x03\xc4\xf1UF\x9e\xba\x96\x14\xca\xa3\n\xf9\xe1"
-    )
+def non_utc_timezone():
+    old_tz = os.environ.get("TZ")
+    os.environ["TZ"] = "America/New_York"
+    time.tzset()
+    yield os.environ["TZ"]
+    if old_tz is None:
+        del os.environ["TZ"]
+    else:
+        os.environ["TZ"] = old_tz
+    time.tzset()
+
+
+@pytest.fixture
+def fake_random_hex(monkeypatch):
+    random_hex = "20f803c4f155469eba9614caa30af9e1"
 
-    def fake_uuid4():
-        return uuid4_constant
+    def fake_random_hex():
+        return random_hex
 
-    monkeypatch.setattr(uuid, "uuid4", fake_uuid4)
-    return uuid4_constant
+    monkeypatch.setattr(ml2p.core, "_random_hex", fake_random_hex)
+    return random_hex
 
 
 class SageMakerFixture:
@@ -126,12 +135,12 @@ class MotoSageMakerFixture:
         self._sagefaker_client = SageFakerClient(aws_region=MOTO_TEST_REGION)
         self._sagefaker_runtime_client = SageFakerRuntimeClient(self._sagefaker_client)
 
-    def mocked_client(self, service):
+    def mocked_client(self, service, **kw):
         if service == "sagemaker":
             return self._sagefaker_client
         elif service == "sagemaker-runtime":
             return self._sagefaker_runtime_client
-        return self._orig_boto_client(service)
+        return self._orig_boto_client(service, **kw)
 
     @contextlib.contextmanager
     def mock_sagemaker(self):
@@ -158,6 +167,8 @@ def moto_session(monkeypatch, moto_sagemaker):
     monkeypatch.setitem(os.environ, "AWS_SECURITY_TOKEN", "dummy-security-token")
     monkeypatch.setitem(os.environ, "AWS_SESSION_TOKEN", "dummy-session-token")
     monkeypatch.setitem(os.environ, "AWS_REGION", MOTO_TEST_REGION)
+    # ensure predictors do not re-use an S3 client created by an earlier test
+    monkeypatch.setattr(ml2p.core, "_S3_CLIENT", None)
     with moto.mock_s3(), moto.mock_ssm(), moto_sagemaker.mock_sagemaker():
         yield boto3.Session(region_name=MOTO_TEST_REGION)
 
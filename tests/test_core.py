@@ -3,23 +3,36 @@
 """ Tests for ml2p.core. """
 
 import io
+import json
 import pathlib
+import subprocess
+import sys
 import tarfile
+import threading
+import time
 
 import pytest
 
+import ml2p.core
 from ml2p import __version__ as ml2p_version
+from ml2p import hyperparameters
 from ml2p.core import (
     S3URL,
     Model,
     ModellingSubCfg,
     ModelPredictor,
     ModelTrainer,
+    _RecordBuffer,
     import_string,
 )
 from ml2p.errors import LocalEnvError
 
 
+def test_import_does_not_import_boto3():
+    code = "import sys, ml2p.core; assert 'boto3' not in sys.modules"
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
 def mk_subcfg(defaults="defaults"):
     return ModellingSubCfg(
         {"sub": {"a": 1, "b": "boo"}, "defaults": {"c": 3}}, "sub", defaults=defaults
@@ -58,6 +71,14 @@ class TestS3URL:
     def test_bucket(self):
         assert S3URL("s3://bucket/foo").bucket() == "bucket"
 
+    def test_invalid_url(self):
+        with pytest.raises(ValueError) as exc_info:
+            S3URL("https://bucket/foo")
+        assert (
+            str(exc_info.value)
+            == "S3 URL 'https://bucket/foo' should start with 's3://'."
+        )
+
     def test_path(self):
         assert S3URL("s3://bucket/foo/").path("bar.txt") == "foo/bar.txt"
 
@@ -67,9 +88,16 @@ class TestS3URL:
     def test_url(self):
         assert S3URL("s3://bucket/foo/").url("bar.txt") == "s3://bucket/foo/bar.txt"
 
+    def test_url_with_empty_root(self):
+        assert S3URL("s3://bucket").url("/bar.txt") == "s3://bucket/bar.txt"
+
     def test_url_with_no_suffix(self):
         assert S3URL("s3://bucket/foo/").url() == "s3://bucket/foo/"
 
+    def test_slots(self):
+        with pytest.raises(AttributeError):
+            S3URL("s3://bucket/foo/").extra = 1
+
 
 class TestSageMakerEnvTrain:
     def test_basic_env(self, sagemaker):
@@ -80,6 +108,32 @@ class TestSageMakerEnvTrain:
         assert env.record_invokes is None
         assert env.project == "test-project"
 
+    def test_settings_are_loaded_lazily(self, sagemaker):
+        env = sagemaker.train()
+        sagemaker.ml_folder.join("input", "config", "hyperparameters.json").write(
+            json.dumps(hyperparameters.encode({"ML2P_ENV": {"ML2P_PROJECT": "late"}}))
+        )
+        assert env.project == "late"
+        assert env.model_cls is None
+        assert env.s3 is None
+
+    def test_changing_hyperparameters_does_not_change_settings(self, sagemaker):
+        env = sagemaker.train()
+        env.hyperparameters().pop("ML2P_ENV")
+        assert "ML2P_ENV" in env.hyperparameters()
+        assert env.project == "test-project"
+        assert env.s3.url() == "s3://foo/bar/"
+
+    def test_settings_can_be_assigned(self, sagemaker):
+        env = sagemaker.train()
+        s3 = S3URL("s3://other/path")
+        env.project = "other-project"
+        env.model_cls = "other.pkg.model"
+        env.s3 = s3
+        assert env.project == "other-project"
+        assert env.model_cls == "other.pkg.model"
+        assert env.s3 is s3
+
     def test_create_env_without_project_name(self, sagemaker):
         env = sagemaker.train(ML2P_PROJECT=None)
         assert env.project is None
@@ -132,6 +186,13 @@ class TestSageMakerEnvServe:
         env = sagemaker.serve(ML2P_MODEL_CLS="my.pkg.model")
         assert env.model_cls == "my.pkg.model"
 
+    def test_settings_can_be_assigned(self, sagemaker):
+        env = sagemaker.serve()
+        env.project = "other-project"
+        env.s3 = None
+        assert env.project == "other-project"
+        assert env.s3 is None
+
     def test_create_env_with_record_invokes(self, sagemaker):
         env = sagemaker.serve(ML2P_RECORD_INVOKES="true")
         assert env.record_invokes is True
@@ -241,6 +302,18 @@ class TestSageMakerEnvGeneric:
         ).write('{"a.b": "1", "a.c": "2"}')
         assert sagemaker.generic().hyperparameters() == {"a": {"b": 1, "c": 2}}
 
+    def test_hyperparameters_are_cached(self, sagemaker):
+        hp_file = (
+            sagemaker.ml_folder.mkdir("input")
+            .mkdir("config")
+            .join("hyperparameters.json")
+        )
+        hp_file.write('{"param": "\\"value\\""}')
+        env = sagemaker.generic()
+        assert env.hyperparameters() == {"param": "value"}
+        hp_file.remove()
+        assert env.hyperparameters() == {"param": "value"}
+
     def test_missing_hyperparameters_file(self, sagemaker):
         assert sagemaker.generic().hyperparameters() == {}
 
@@ -250,14 +323,50 @@ class TestSageMakerEnvGeneric:
         ).write('{"config": "value"}')
         assert sagemaker.generic().resourceconfig() == {"config": "value"}
 
+    def test_resourceconfig_is_cached(self, sagemaker):
+        rc_file = (
+            sagemaker.ml_folder.mkdir("input")
+            .mkdir("config")
+            .join("resourceconfig.json")
+        )
+        rc_file.write('{"config": "value"}')
+        env = sagemaker.generic()
+        assert env.resourceconfig() == {"config": "value"}
+        rc_file.remove()
+        assert env.resourceconfig() == {"config": "value"}
+
+    def test_resourceconfig_without_orjson(self, sagemaker, monkeypatch):
+        monkeypatch.setattr(ml2p.core, "orjson", None)
+        sagemaker.ml_folder.mkdir("input").mkdir("config").join(
+            "resourceconfig.json"
+        ).write('{"config": "value"}')
+        assert sagemaker.generic().resourceconfig() == {"config": "value"}
+
+    def test_changing_resourceconfig_does_not_change_cache(self, sagemaker):
+        sagemaker.ml_folder.mkdir("input").mkdir("config").join(
+            "resourceconfig.json"
+        ).write('{"config": {"nested": "value"}}')
+        env = sagemaker.generic()
+        env.resourceconfig()["config"]["nested"] = "changed"
+        assert env.resourceconfig() == {"config": {"nested": "value"}}
+
     def test_missing_resourceconfig_file(self, sagemaker):
         assert sagemaker.generic().resourceconfig() == {}
 
-    def test_dataset_folder(self, sagemaker):
+    def test_dataset_folder(self, sagemaker, monkeypatch):
+        monkeypatch.setattr(ml2p.core, "_dataset_folder_warned", False)
         with pytest.deprecated_call():
             result = sagemaker.generic().dataset_folder("foo")
         assert result == pathlib.Path(str(sagemaker.ml_folder.join("input/data/foo")))
 
+    def test_dataset_folder_warns_once(self, sagemaker, monkeypatch, recwarn):
+        monkeypatch.setattr(ml2p.core, "_dataset_folder_warned", False)
+        env = sagemaker.generic()
+        env.dataset_folder("foo")
+        env.dataset_folder("bar")
+        assert len(recwarn.list) == 1
+        assert recwarn.pop(DeprecationWarning)
+
     def test_dataset_folder_default(self, sagemaker):
         assert sagemaker.generic().dataset_folder() == pathlib.Path(
             str(sagemaker.ml_folder.join("input/data/training"))
@@ -285,6 +394,15 @@ class TestImportString:
         cls = import_string("tests.test_core.TestImportString")
         assert cls is TestImportString
 
+    def test_import_string_is_cached(self, monkeypatch):
+        import_string.cache_clear()
+        cls = import_string("tests.test_core.TestImportString")
+        monkeypatch.delattr(sys.modules["tests.test_core"], "TestImportString")
+        assert import_string("tests.test_core.TestImportString") is cls
+        import_string.cache_clear()
+        with pytest.raises(AttributeError):
+            import_string("tests.test_core.TestImportString")
+
 
 class TestModelTrainer:
     def test_create(self, sagemaker):
@@ -310,6 +428,18 @@ class TestModelPredictor:
         predictor = ModelPredictor(env)
         assert predictor.env is env
 
+    def test_s3_client_is_shared(self, sagemaker):
+        env = sagemaker.serve()
+        predictor_1 = ModelPredictor(env)
+        predictor_2 = ModelPredictor(env)
+        assert predictor_1.s3_client is predictor_2.s3_client
+        assert predictor_1.s3_client.meta.config.max_pool_connections == 50
+
+    def test_sub_classes_may_set_attributes(self, sagemaker):
+        predictor = DummyPredictor(sagemaker.serve())
+        predictor.model = "model"
+        assert predictor.model == "model"
+
     def test_setup(self, sagemaker):
         predictor = ModelPredictor(sagemaker.serve())
         predictor.setup()
@@ -324,7 +454,7 @@ class TestModelPredictor:
             predictor.invoke({})
         assert str(exc_info.value) == "Sub-classes should implement .result(...)"
 
-    def test_invoke_with_result_implemented(self, sagemaker, fake_utcnow):
+    def test_invoke_with_result_implemented(self, sagemaker, fake_time):
         predictor = DummyPredictor(sagemaker.serve())
         assert predictor.invoke({"input": 1}) == {
             "metadata": {
@@ -335,25 +465,120 @@ class TestModelPredictor:
             "result": {"probability": 0.5, "input": 1},
         }
 
-    def test_invoke_with_recording(self, sagemaker, fake_utcnow, fake_uuid4):
+    def test_invoke_without_recording(self, sagemaker):
+        predictor = DummyPredictor(sagemaker.serve())
+        predictor.invoke({"input": 1})
+        predictor.batch_invoke([{"input": 1}, {"input": 2}])
+        assert sagemaker.s3.list_objects_v2(Bucket="foo")["KeyCount"] == 0
+
+    def test_record_invokes_is_read_when_created(self, sagemaker):
+        env = sagemaker.serve()
+        predictor = DummyPredictor(env)
+        env.record_invokes = True
+        predictor.invoke({"input": 1})
+        assert sagemaker.s3.list_objects_v2(Bucket="foo")["KeyCount"] == 0
+
+    def test_invoke_with_recording(self, sagemaker, fake_time, fake_random_hex):
         predictor = DummyPredictor(sagemaker.serve(ML2P_RECORD_INVOKES="true"))
         data = {"input": 1}
         prediction = predictor.invoke(data)
         record = sagemaker.s3_get_object(
             "foo",
             "bar/predictions/test-model-1.2.3/"
-            "ts-2019-01-31T12:00:02+00:00--"
-            "uuid-20f803c4-f155-469e-ba96-14caa30af9e1.json",
+            "ts-2019-01-31T12:00:02.000000--"
+            "uuid-20f803c4f155469eba9614caa30af9e1.json",
         )
         assert record == {"input": data, "result": prediction}
 
+    def test_invoke_with_background_recording(self, sagemaker, fake_time):
+        class BackgroundPredictor(DummyPredictor):
+            RECORD_BACKGROUND_WORKERS = 2
+
+            def record_invoke_id(self, datum, prediction):
+                return {"input": datum["input"]}
+
+        predictor = BackgroundPredictor(sagemaker.serve(ML2P_RECORD_INVOKES="true"))
+        prediction = predictor.invoke({"input": 0})
+        batch_prediction = predictor.batch_invoke([{"input": 1}, {"input": 2}])
+        predictor.teardown()
+        predictions = [prediction] + batch_prediction["predictions"]
+        for i in range(3):
+            record = sagemaker.s3_get_object(
+                "foo", "bar/predictions/test-model-1.2.3/input-{}.json".format(i)
+            )
+            assert record == {"input": {"input": i}, "result": predictions[i]}
+
+    def test_background_recording_after_teardown(self, sagemaker, fake_time):
+        class BackgroundPredictor(DummyPredictor):
+            RECORD_BACKGROUND_WORKERS = 1
+            RECORD_BACKGROUND_MAX_PENDING = 1
+
+            def record_invoke_id(self, datum, prediction):
+                return {"input": datum["input"]}
+
+        predictor = BackgroundPredictor(sagemaker.serve(ML2P_RECORD_INVOKES="true"))
+        predictor.teardown()
+        predictions = [predictor.invoke({"input": i}) for i in range(2)]
+        for i in range(2):
+            record = sagemaker.s3_get_object(
+                "foo", "bar/predictions/test-model-1.2.3/input-{}.json".format(i)
+            )
+            assert record == {"input": {"input": i}, "result": predictions[i]}
+
+    def test_background_recording_failure(self, sagemaker, capsys):
+        class BackgroundPredictor(DummyPredictor):
+            RECORD_BACKGROUND_WORKERS = 1
+
+            def record_invoke(self, datum, prediction):
+                raise ValueError("Record lost")
+
+        predictor = BackgroundPredictor(sagemaker.serve(ML2P_RECORD_INVOKES="true"))
+        predictor.invoke({"input": 1})
+        predictor.teardown()
+        assert "ValueError: Record lost" in capsys.readouterr().err
+
+    def test_invoke_with_buffered_recording(self, sagemaker, fake_time):
+        class BufferedPredictor(DummyPredictor):
+            RECORD_BUFFER_SIZE = 2
+
+        predictor = BufferedPredictor(sagemaker.serve(ML2P_RECORD_INVOKES="true"))
+        prediction = predictor.invoke({"input": 0})
+        batch_prediction = predictor.batch_invoke([{"input": 1}, {"input": 2}])
+        predictions = [prediction] + batch_prediction["predictions"]
+
+        def s3_records():
+            response = sagemaker.s3.list_objects_v2(Bucket="foo")
+            keys = sorted(obj["Key"] for obj in response.get("Contents", []))
+            records = []
+            for key in keys:
+                assert key.startswith("bar/predictions/test-model-1.2.3/batch--ts-")
+                assert key.endswith(".ndjson")
+                body = sagemaker.s3.get_object(Bucket="foo", Key=key)["Body"].read()
+                records.append([json.loads(line) for line in body.splitlines()])
+            return records
+
+        [first_batch] = s3_records()
+        assert [r["input"] for r in first_batch] == [{"input": 0}, {"input": 1}]
+        assert [r["result"] for r in first_batch] == predictions[:2]
+        assert all(r["id"]["ts"] == "2019-01-31T12:00:02.000000" for r in first_batch)
+
+        predictor.teardown()
+        [last_batch] = [batch for batch in s3_records() if batch != first_batch]
+        assert last_batch == [
+            {
+                "id": last_batch[0]["id"],
+                "input": {"input": 2},
+                "result": predictions[2],
+            }
+        ]
+
     def test_invoke_batch_with_result_not_implemented(self, sagemaker):
         predictor = ModelPredictor(sagemaker.serve())
         with pytest.raises(NotImplementedError) as exc_info:
             predictor.batch_invoke([{}])
         assert str(exc_info.value) == "Sub-classes should implement .result(...)"
 
-    def test_invoke_batch_with_result_implemented(self, sagemaker, fake_utcnow):
+    def test_invoke_batch_with_result_implemented(self, sagemaker, fake_time):
         predictor = DummyPredictor(sagemaker.serve())
         assert predictor.batch_invoke([{"input": 1}]) == {
             "predictions": [
@@ -368,19 +593,98 @@ class TestModelPredictor:
             ]
         }
 
-    def test_invoke_batch_with_recording(self, sagemaker, fake_utcnow, fake_uuid4):
+    def test_invoke_batch_with_batch_workers(self, sagemaker, fake_time):
+        class ThreadedPredictor(DummyPredictor):
+            BATCH_WORKERS = 4
+
+        predictor = ThreadedPredictor(sagemaker.serve())
+        data = [{"input": i} for i in range(10)]
+        assert predictor.batch_invoke(data) == {
+            "predictions": [
+                {
+                    "metadata": {
+                        "model_version": "test-model-1.2.3",
+                        "ml2p_version": str(ml2p_version),
+                        "timestamp": 1548936002.0,
+                    },
+                    "result": {"probability": 0.5, "input": i},
+                }
+                for i in range(10)
+            ]
+        }
+
+    def test_batch_result_reuses_pool(self, sagemaker):
+        class ThreadedPredictor(DummyPredictor):
+            BATCH_WORKERS = 4
+
+        predictor = ThreadedPredictor(sagemaker.serve())
+        pool = predictor._batch_result_pool
+        data = [{"input": i} for i in range(3)]
+        expected = [{"probability": 0.5, "input": i} for i in range(3)]
+        assert predictor.batch_result(data) == expected
+        assert predictor.batch_result(data) == expected
+        assert predictor._batch_result_pool is pool
+        predictor.teardown()
+        assert predictor.batch_result(data) == expected
+
+    def test_batch_result_is_serial_by_default(self, sagemaker):
+        predictor = DummyPredictor(sagemaker.serve())
+        assert predictor._batch_result_pool is None
+
+    def test_invoke_batch_with_recording(self, sagemaker, fake_time, fake_random_hex):
         predictor = DummyPredictor(sagemaker.serve(ML2P_RECORD_INVOKES="true"))
         data = {"input": 1}
         prediction = predictor.batch_invoke([data])
         record = sagemaker.s3_get_object(
             "foo",
             "bar/predictions/test-model-1.2.3/"
-            "ts-2019-01-31T12:00:02+00:00--"
-            "uuid-20f803c4-f155-469e-ba96-14caa30af9e1.json",
+            "ts-2019-01-31T12:00:02.000000--"
+            "uuid-20f803c4f155469eba9614caa30af9e1.json",
         )
         assert record == {"input": data, "result": prediction["predictions"][0]}
 
-    def test_metadata(self, sagemaker, fake_utcnow):
+    def test_invoke_batch_with_recording_multiple(self, sagemaker, fake_time):
+        class NumberedPredictor(DummyPredictor):
+            RECORD_WORKERS = 4
+
+            def record_invoke_id(self, datum, prediction):
+                return {"input": datum["input"]}
+
+        predictor = NumberedPredictor(sagemaker.serve(ML2P_RECORD_INVOKES="true"))
+        pool = predictor._batch_record_pool
+        data = [{"input": i} for i in range(20)]
+        prediction = predictor.batch_invoke(data)
+        for i in range(20):
+            record = sagemaker.s3_get_object(
+                "foo", "bar/predictions/test-model-1.2.3/input-{}.json".format(i)
+            )
+            assert record == {"input": data[i], "result": prediction["predictions"][i]}
+        predictor.batch_invoke(data)
+        assert predictor._batch_record_pool is pool
+        predictor.teardown()
+
+    def test_invoke_batch_with_recording_after_teardown(self, sagemaker, fake_time):
+        class NumberedPredictor(DummyPredictor):
+            RECORD_WORKERS = 4
+
+            def record_invoke_id(self, datum, prediction):
+                return {"input": datum["input"]}
+
+        predictor = NumberedPredictor(sagemaker.serve(ML2P_RECORD_INVOKES="true"))
+        predictor.teardown()
+        data = [{"input": i} for i in range(3)]
+        prediction = predictor.batch_invoke(data)
+        for i in range(3):
+            record = sagemaker.s3_get_object(
+                "foo", "bar/predictions/test-model-1.2.3/input-{}.json".format(i)
+            )
+            assert record == {"input": data[i], "result": prediction["predictions"][i]}
+
+    def test_batch_record_invoke_is_serial_by_default(self, sagemaker):
+        predictor = DummyPredictor(sagemaker.serve(ML2P_RECORD_INVOKES="true"))
+        assert predictor._batch_record_pool is None
+
+    def test_metadata(self, sagemaker, fake_time):
         predictor = ModelPredictor(sagemaker.serve())
         assert predictor.metadata() == {
             "model_version": "test-model-1.2.3",
@@ -394,7 +698,7 @@ class TestModelPredictor:
             predictor.result({})
         assert str(exc_info.value) == "Sub-classes should implement .result(...)"
 
-    def test_record_invoke(self, sagemaker, fake_utcnow, fake_uuid4):
+    def test_record_invoke(self, sagemaker, fake_time, fake_random_hex):
         predictor = ModelPredictor(sagemaker.serve())
         datum = {"feature_a": 1, "feature_b": "b"}
         prediction = {
@@ -405,18 +709,189 @@ class TestModelPredictor:
         record = sagemaker.s3_get_object(
             "foo",
             "bar/predictions/test-model-1.2.3/"
-            "ts-2019-01-31T12:00:02+00:00--"
-            "uuid-20f803c4-f155-469e-ba96-14caa30af9e1.json",
+            "ts-2019-01-31T12:00:02.000000--"
+            "uuid-20f803c4f155469eba9614caa30af9e1.json",
+        )
+        assert record == {"input": datum, "result": prediction}
+
+    def test_record_invoke_with_numpy_values(
+        self, sagemaker, monkeypatch, fake_time, fake_random_hex
+    ):
+        np = pytest.importorskip("numpy")
+
+        def fail_json_dumps(obj):
+            raise AssertionError("NumPy values should be encoded by orjson")
+
+        predictor = ModelPredictor(sagemaker.serve())
+        datum = {"feature_a": np.int64(2)}
+        prediction = {
+            "metadata": predictor.metadata(),
+            "result": {"probability": np.float64(0.5), "scores": np.array([1, 2])},
+        }
+        with monkeypatch.context() as mp:
+            mp.setattr(ml2p.core.json, "dumps", fail_json_dumps)
+            predictor.record_invoke(datum, prediction)
+        record = sagemaker.s3_get_object(
+            "foo",
+            "bar/predictions/test-model-1.2.3/"
+            "ts-2019-01-31T12:00:02.000000--"
+            "uuid-20f803c4f155469eba9614caa30af9e1.json",
+        )
+        assert record == {
+            "input": {"feature_a": 2},
+            "result": {
+                "metadata": prediction["metadata"],
+                "result": {"probability": 0.5, "scores": [1, 2]},
+            },
+        }
+
+    def test_record_invoke_with_values_orjson_rejects(
+        self, sagemaker, fake_time, fake_random_hex
+    ):
+        class Probability(float):
+            pass
+
+        predictor = ModelPredictor(sagemaker.serve())
+        datum = {"feature_a": 2 ** 70}
+        prediction = {
+            "metadata": predictor.metadata(),
+            "result": {"probability": Probability(0.5)},
+        }
+        predictor.record_invoke(datum, prediction)
+        record = sagemaker.s3_get_object(
+            "foo",
+            "bar/predictions/test-model-1.2.3/"
+            "ts-2019-01-31T12:00:02.000000--"
+            "uuid-20f803c4f155469eba9614caa30af9e1.json",
         )
         assert record == {"input": datum, "result": prediction}
 
-    def test_record_invoke_id(self, sagemaker, fake_utcnow, fake_uuid4):
+    def test_record_invoke_without_orjson(
+        self, sagemaker, monkeypatch, fake_time, fake_random_hex
+    ):
+        monkeypatch.setattr(ml2p.core, "orjson", None)
+        predictor = ModelPredictor(sagemaker.serve())
+        datum = {"feature_a": 1, "feature_b": "b"}
+        prediction = {"metadata": predictor.metadata(), "result": {1: 0.5}}
+        predictor.record_invoke(datum, prediction)
+        record = sagemaker.s3_get_object(
+            "foo",
+            "bar/predictions/test-model-1.2.3/"
+            "ts-2019-01-31T12:00:02.000000--"
+            "uuid-20f803c4f155469eba9614caa30af9e1.json",
+        )
+        assert record == {
+            "input": datum,
+            "result": {**prediction, "result": {"1": 0.5}},
+        }
+
+    def test_record_invoke_id(self, sagemaker, fake_time, fake_random_hex):
         predictor = ModelPredictor(sagemaker.serve())
         assert predictor.record_invoke_id({"a": "inputs"}, {"b": "outputs"}) == {
-            "ts": "2019-01-31T12:00:02+00:00",
-            "uuid": "20f803c4-f155-469e-ba96-14caa30af9e1",
+            "ts": "2019-01-31T12:00:02.000000",
+            "uuid": "20f803c4f155469eba9614caa30af9e1",
         }
 
+    def test_record_invoke_id_uuid_is_random(self, sagemaker):
+        predictor = ModelPredictor(sagemaker.serve())
+        uuid_1 = predictor.record_invoke_id({}, {})["uuid"]
+        uuid_2 = predictor.record_invoke_id({}, {})["uuid"]
+        assert len(uuid_1) == 32
+        assert int(uuid_1, 16) >= 0
+        assert uuid_1 != uuid_2
+
+    def test_record_invoke_id_with_microseconds(
+        self, sagemaker, monkeypatch, fake_random_hex
+    ):
+        monkeypatch.setattr(time, "time", lambda: 1548936002.5)
+        predictor = ModelPredictor(sagemaker.serve())
+        invoke_id = predictor.record_invoke_id({"a": "inputs"}, {"b": "outputs"})
+        assert invoke_id["ts"] == "2019-01-31T12:00:02.500000"
+
+    def test_record_invoke_id_ignores_local_timezone(
+        self, sagemaker, fake_time, fake_random_hex, non_utc_timezone
+    ):
+        predictor = ModelPredictor(sagemaker.serve())
+        invoke_id = predictor.record_invoke_id({"a": "inputs"}, {"b": "outputs"})
+        assert invoke_id["ts"] == "2019-01-31T12:00:02.000000"
+        assert predictor.metadata()["timestamp"] == 1548936002.0
+
+
+class TestRecordBuffer:
+    def test_write_when_full(self):
+        writes = []
+        buf = _RecordBuffer(max_records=2, max_seconds=60, write=writes.append)
+        buf.add(b"1")
+        assert writes == []
+        buf.add(b"2")
+        assert writes == [[b"1", b"2"]]
+
+    def test_write_when_idle(self):
+        writes = []
+        written = threading.Event()
+
+        def write(records):
+            writes.append(records)
+            written.set()
+
+        buf = _RecordBuffer(max_records=10, max_seconds=0.01, write=write)
+        buf.add(b"1")
+        assert written.wait(timeout=5)
+        assert writes == [[b"1"]]
+        buf.flush()
+        assert writes == [[b"1"]]
+
+    def test_write_when_idle_failure(self, capsys):
+        written = threading.Event()
+
+        def write(records):
+            written.set()
+            raise ValueError("Records lost")
+
+        buf = _RecordBuffer(max_records=10, max_seconds=0.01, write=write)
+        buf.add(b"1")
+        assert written.wait(timeout=5)
+        err = ""
+        for _ in range(500):
+            err += capsys.readouterr().err
+            if "ValueError: Records lost" in err:
+                break
+            time.sleep(0.01)
+        else:
+            pytest.fail("Timer failure was not reported")
+
+    def test_flush_waits_for_timer_write(self):
+        writes = []
+        writing = threading.Event()
+
+        def slow_write(records):
+            writing.set()
+            time.sleep(0.2)
+            writes.append(records)
+
+        buf = _RecordBuffer(max_records=10, max_seconds=0.01, write=slow_write)
+        buf.add(b"1")
+        assert writing.wait(timeout=5)
+        buf.flush()
+        assert writes == [[b"1"]]
+
+    def test_flush_cancels_timer(self):
+        writes = []
+        buf = _RecordBuffer(max_records=10, max_seconds=0.01, write=writes.append)
+        buf.add(b"1")
+        buf.flush()
+        time.sleep(0.05)
+        assert writes == [[b"1"]]
+
+    def test_flush(self):
+        writes = []
+        buf = _RecordBuffer(max_records=10, max_seconds=60, write=writes.append)
+        buf.flush()
+        assert writes == []
+        buf.add(b"1")
+        buf.flush()
+        assert writes == [[b"1"]]
+
 
 class TestModel:
     def test_trainer_not_set(self, sagemaker):
@@ -433,6 +908,19 @@ class TestModel:
         assert trainer.__class__ is ModelTrainer
         assert trainer.env is env
 
+    def test_combined_trainer_and_predictor(self, sagemaker):
+        class TrainerPredictor(ModelTrainer, DummyPredictor):
+            pass
+
+        class MyModel(Model):
+            TRAINER = TrainerPredictor
+            PREDICTOR = TrainerPredictor
+
+        env = sagemaker.serve()
+        predictor = MyModel().predictor(env)
+        assert predictor.env is env
+        assert predictor.result({"input": 1}) == {"probability": 0.5, "input": 1}
+
     def test_predictor_not_set(self, sagemaker):
         with pytest.raises(ValueError) as exc_info:
             Model().predictor(sagemaker.serve())
@@ -300,7 +300,7 @@ class TestAPI:
             "ml2p_version": str(ml2p_version),
         }
 
-    def test_invocations(self, api_client, fake_utcnow):
+    def test_invocations(self, api_client, fake_time):
         response = api_client.post("/invocations", json={"input": 12345})
         assert response.status_code == 200
         assert response.content_type == "application/json"
@@ -308,12 +308,12 @@ class TestAPI:
             "metadata": {
                 "model_version": "test-model-1.2.3",
                 "ml2p_version": str(ml2p_version),
-                "timestamp": fake_utcnow.timestamp(),
+                "timestamp": fake_time,
             },
             "result": {"probability": 0.5, "input": 12345},
         }
 
-    def test_batch_invocations(self, api_client, fake_utcnow):
+    def test_batch_invocations(self, api_client, fake_time):
         response = api_client.post(
             "/invocations", json={"instances": [{"input": 12345}, {"input": 12346}]}
         )
@@ -325,7 +325,7 @@ class TestAPI:
                     "metadata": {
                         "model_version": "test-model-1.2.3",
                         "ml2p_version": str(ml2p_version),
-                        "timestamp": fake_utcnow.timestamp(),
+                        "timestamp": fake_time,
                     },
                     "result": {"probability": 0.5, "input": 12345},
                 },
@@ -333,20 +333,20 @@ class TestAPI:
                     "metadata": {
                         "model_version": "test-model-1.2.3",
                         "ml2p_version": str(ml2p_version),
-                        "timestamp": fake_utcnow.timestamp(),
+                        "timestamp": fake_time,
                     },
                     "result": {"probability": 0.5, "input": 12346},
                 },
             ]
         }
 
-    def test_invocation_with_generic_error(self, api_client, fake_utcnow):
+    def test_invocation_with_generic_error(self, api_client, fake_time):
         with pytest.raises(Exception) as err:
             api_client.post("/invocations", json={"generic_error": "test error"})
         assert str(err.value) == "test error"
         assert err.value.__class__ is Exception
 
-    def test_invocation_with_flask_api_error(self, api_client, fake_utcnow):
+    def test_invocation_with_flask_api_error(self, api_client, fake_time):
         response = api_client.post(
             "/invocations", json={"flask_api_error": "message eep"}
         )
@@ -354,19 +354,19 @@ class TestAPI:
         assert response.content_type == "application/json"
         assert response.get_json() == {"message": "message eep"}
 
-    def test_invocation_with_client_error(self, api_client, fake_utcnow):
+    def test_invocation_with_client_error(self, api_client, fake_time):
         response = api_client.post("/invocations", json={"client_error": "bad param"})
         assert response.status_code == 400
         assert response.content_type == "application/json"
         assert response.get_json() == {"message": "client", "details": ["bad param"]}
 
-    def test_invocation_with_server_error(self, api_client, fake_utcnow):
+    def test_invocation_with_server_error(self, api_client, fake_time):
         response = api_client.post("/invocations", json={"server_error": "eep"})
         assert response.status_code == 500
         assert response.content_type == "application/json"
         assert response.get_json() == {"message": "server", "details": ["eep"]}
 
-    def test_execution_parameters(self, api_client, fake_utcnow):
+    def test_execution_parameters(self, api_client, fake_time):
         response = api_client.get("/execution-parameters")
         assert response.status_code == 200
         assert response.content_type == "application/json"